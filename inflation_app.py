@@ -1,87 +1,169 @@
+import bisect
+import io
 import streamlit as st 
 import pandas as pd
-import matplotlib.pyplot as plt
+import altair as alt
+import numpy as np
+from matplotlib.figure import Figure
 import matplotlib.ticker as ticker
 from datetime import datetime
 
-# Load the dataset
-df = pd.read_csv("nigeria_inflation.csv")
-df.rename(columns={"observation_date": "Date", "FPCPITOTLZGNGA": "CPI"}, inplace=True)
-df["Date"] = pd.to_datetime(df["Date"])
-df.sort_values("Date", inplace=True)
+# Static page content
+SIDEBAR_HTML = """
+<h2>📊 Inflation Impact Simulator</h2>
+<p style='font-size:16px;'>Understand how inflation has affected your spending power in Nigeria over the last decade.</p>
+<h4> What is CPI?</h4>
+<p style='font-size:16px;'>The Consumer Price Index (CPI) tracks changes in the average prices of goods and services over time. A rising CPI indicates inflation — your money buys less than before.</p>
+<h4>📊 Understanding the CPI Trend</h4>
+<p style='font-size:16px;'>
+Over the last 10 years, Nigeria’s CPI has shown a steady upward trend. This means prices of everyday goods and services have been consistently rising.
+<br><br>
+- A rising CPI = inflation = reduced purchasing power.<br>
+- In Nigeria, this trend reflects the effects of naira devaluation, increased import costs, and fuel prices.<br>
+- For instance, what ₦1,000 bought 10 years ago may now cost over ₦4,000.<br>
+- A higher CPI over time means the value of your money in the past was greater than today.
+</p>
+
+<h4> Bag of Rice Example</h4>
+<div style='font-size:15px;'>
+Imagine you buy a <strong>bag of rice</strong> today for ₦60,000.<br><br>
+The simulator may show this equals ₦12,500 in the year 2000 based on CPI.<br><br>
+But real market records might show a bag cost ₦2,500 in 2000. Why the difference?<br><br>
+<strong>CPI</strong> is not about the actual price of rice—it's about how <em>money’s value</em> changes across many products.<br>
+It answers: "What was ₦60,000 worth back then, based on general price changes?"<br><br>
+✔️ <i>Use this to understand inflation’s effect on purchasing power, not exact product prices.</i>
+</div>
+"""
+
+WELCOME_HTML = """
+<h1 style='text-align: center; font-size: 36px;'>🇳🇬 Nigerian Inflation Impact Simulator</h1>
+<h3 style='text-align: center; font-size: 20px;'>👋 Welcome! Discover how inflation has shaped the value of money in Nigeria using CPI data.</h3>
+"""
+
+RECS_MD = """
+- Review your savings plan regularly to factor in inflation.
+- Invest in inflation-resistant assets like real estate, stocks, or commodities.
+- Diversify your income sources to cushion against inflation shocks.
+- Monitor economic policies and global trends that affect inflation in Nigeria.
+- Use budgeting apps to track the real value of your expenses over time.
+"""
 
 # Set page config
 st.set_page_config(page_title="Inflation Impact Simulator", layout="wide")
 
+# Load the dataset once and reuse it across reruns
+@st.cache_data
+def load_data(path="nigeria_inflation.csv"):
+    df = pd.read_csv(path, parse_dates=["observation_date"]).rename(
+        columns={"observation_date": "Date", "FPCPITOTLZGNGA": "CPI"}
+    )
+    df.sort_values("Date", inplace=True, kind="stable", ignore_index=True)
+    # Only Year is narrowed; CPI stays float64 because it feeds the ₦ amounts shown
+    df["Year"] = df["Date"].dt.year.astype("int16")
+    return df
+
+# Derived values that only depend on the dataset
+@st.cache_data
+def load_summary(df):
+    dates_np = df["Date"].values.astype("datetime64[ns]")
+    cpi_np = df["CPI"].to_numpy()
+    latest_cpi = cpi_np[-1]
+    year_cpi = df.groupby("Year")["CPI"].mean()
+    years_desc = year_cpi.index.sort_values(ascending=False).tolist()
+    max_date = df["Date"].iloc[-1]
+    max_year_str = max_date.strftime("%Y")
+
+    # 10-year CPI change for the header metric; Date is sorted, so binary search
+    i = np.searchsorted(dates_np, np.datetime64(max_date - pd.DateOffset(years=10)), side="right") - 1
+    past_cpi = cpi_np[i] if i >= 0 else cpi_np[0]
+    cpi_change = ((latest_cpi - past_cpi) / past_cpi) * 100
+
+    return {
+        "dates_np": dates_np,
+        "cpi_np": cpi_np,
+        "latest_cpi": latest_cpi,
+        "years_desc": years_desc,
+        "year_cpi": year_cpi,
+        "max_date": max_date,
+        "max_year_str": max_year_str,
+        "cpi_change": cpi_change,
+    }
+
+# Largest-Triangle-Three-Buckets downsampling for line charts
+def lttb_points(dates, values, n_out):
+    n = len(values)
+    if n <= n_out or n_out < 3:
+        return dates, values
+
+    x = dates.astype("int64").astype(np.float64)
+    y = values.astype(np.float64)
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(int), n)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_x = x[end:edges[i + 2]].mean()
+        next_y = y[end:edges[i + 2]].mean()
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return dates[idx], values[idx]
+
+# Render the CPI Trend chart once; it only changes when the dataset does.
+# Underscored arguments are not hashed, so the cache is keyed by `key` alone.
+@st.cache_data
+def cpi_trend_png(_dates_np, _cpi_np, key):
+    # A bare Figure skips pyplot's global figure registry, so nothing needs closing
+    fig = Figure(figsize=(10, 4))
+    dpi = 200
+    ax = fig.subplots()
+    # Keep at most ~2 points per horizontal pixel; anything more is invisible
+    max_points = int(2 * fig.get_figwidth() * dpi)
+    plot_dates, plot_cpi = lttb_points(_dates_np, _cpi_np, max_points)
+    ax.plot(plot_dates, plot_cpi, color="darkgreen")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("CPI")
+    ax.set_title("CPI Trend Over Time", fontsize=14)
+    ax.grid(True)
+    ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+df = load_data()
+summary = load_summary(df)
+df_key = (len(df), summary["max_date"])
+
 # Sidebar - About section
 with st.sidebar:
-    st.markdown("""
-    <h2>📊 Inflation Impact Simulator</h2>
-    <p style='font-size:16px;'>Understand how inflation has affected your spending power in Nigeria over the last decade.</p>
-    <h4> What is CPI?</h4>
-    <p style='font-size:16px;'>The Consumer Price Index (CPI) tracks changes in the average prices of goods and services over time. A rising CPI indicates inflation — your money buys less than before.</p>
-    <h4>📊 Understanding the CPI Trend</h4>
-    <p style='font-size:16px;'>
-    Over the last 10 years, Nigeria’s CPI has shown a steady upward trend. This means prices of everyday goods and services have been consistently rising.
-    <br><br>
-    - A rising CPI = inflation = reduced purchasing power.<br>
-    - In Nigeria, this trend reflects the effects of naira devaluation, increased import costs, and fuel prices.<br>
-    - For instance, what ₦1,000 bought 10 years ago may now cost over ₦4,000.<br>
-    - A higher CPI over time means the value of your money in the past was greater than today.
-    </p>
-
-    <h4> Bag of Rice Example</h4>
-    <div style='font-size:15px;'>
-    Imagine you buy a <strong>bag of rice</strong> today for ₦60,000.<br><br>
-    The simulator may show this equals ₦12,500 in the year 2000 based on CPI.<br><br>
-    But real market records might show a bag cost ₦2,500 in 2000. Why the difference?<br><br>
-    <strong>CPI</strong> is not about the actual price of rice—it's about how <em>money’s value</em> changes across many products.<br>
-    It answers: "What was ₦60,000 worth back then, based on general price changes?"<br><br>
-    ✔️ <i>Use this to understand inflation’s effect on purchasing power, not exact product prices.</i>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(SIDEBAR_HTML)
 
 # Welcome Message
-st.markdown("""
-<h1 style='text-align: center; font-size: 36px;'>🇳🇬 Nigerian Inflation Impact Simulator</h1>
-<h3 style='text-align: center; font-size: 20px;'>👋 Welcome! Discover how inflation has shaped the value of money in Nigeria using CPI data.</h3>
-""", unsafe_allow_html=True)
+st.html(WELCOME_HTML)
 
 # Show 10-year average CPI change
-latest_cpi = df["CPI"].iloc[-1]
-ten_years_ago = df["Date"].max() - pd.DateOffset(years=10)
-closest_past = df[df["Date"] <= ten_years_ago]["CPI"]
-if not closest_past.empty:
-    past_cpi = closest_past.iloc[-1]
-else:
-    past_cpi = df["CPI"].iloc[0]
-
-cpi_change = ((latest_cpi - past_cpi) / past_cpi) * 100
-st.metric("10-Year Average Inflation Rate", f"{cpi_change:.2f}%")
+st.metric("10-Year Average Inflation Rate", f"{summary['cpi_change']:.2f}%")
 
 # CPI Trend chart
 st.subheader("📈 Inflation Trend (CPI-Based)")
-fig, ax = plt.subplots(figsize=(10, 4))
-ax.plot(df["Date"], df["CPI"], color="darkgreen")
-ax.set_xlabel("Date")
-ax.set_ylabel("CPI")
-ax.set_title("CPI Trend Over Time", fontsize=14)
-ax.grid(True)
-ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
-st.pyplot(fig)
+st.image(cpi_trend_png(_dates_np=summary["dates_np"], _cpi_np=summary["cpi_np"], key=df_key), use_container_width=True)
 
 # Category-wise spending input with subcategory dropdowns
 st.markdown("<h2 style='margin-top:30px;'>🛒 Predict Today's Value Compared to a Past Year</h2>", unsafe_allow_html=True)
 st.markdown("<p style='font-size:16px;'>Estimate how much your money could buy in a selected past year by entering your current spending.</p>", unsafe_allow_html=True)
 
 # Year selection
-years = df["Date"].dt.year.unique().tolist()
-years.sort(reverse=True)
-comparison_year = st.selectbox("Select a year to compare with", years[1:], index=years.index(datetime.now().year - 10))
+year_options = summary["years_desc"][1:]
+target_year = datetime.now().year - 10
+# Years are descending, so bisect on the negated values finds the first year <= target
+default_idx = min(bisect.bisect_left(year_options, -target_year, key=lambda y: -y), len(year_options) - 1)
+comparison_year = st.selectbox("Select a year to compare with", year_options, index=default_idx)
 
 # Get CPI for comparison year
-if comparison_year in df["Date"].dt.year.values:
-    past_cpi_year = df[df["Date"].dt.year == comparison_year]["CPI"].mean()
+if comparison_year in summary["year_cpi"].index:
+    past_cpi_year = summary["year_cpi"].loc[comparison_year]
 else:
     st.error("Selected comparison year is not available in the dataset.")
 
@@ -98,29 +180,34 @@ categories = {
     "Electronics": ["Phone", "Laptop", "TV", "Tablet"]
 }
 
-col1, col2, col3 = st.columns(3)
-with col1:
-    for cat in ["Food", "Transport"]:
-        sub = st.selectbox(f"Select a subcategory for {cat}", categories[cat], key=f"{cat}_sub")
-        val = st.number_input(f"{cat} - {sub}", min_value=0.0, value=10000.0, step=100.0, key=f"{cat}_input")
-        category_inputs[f"{cat} ({sub})"] = val
-
-with col2:
-    for cat in ["Housing", "Clothing"]:
-        sub = st.selectbox(f"Select a subcategory for {cat}", categories[cat], key=f"{cat}_sub")
-        val = st.number_input(f"{cat} - {sub}", min_value=0.0, value=10000.0, step=100.0, key=f"{cat}_input")
-        category_inputs[f"{cat} ({sub})"] = val
-
-with col3:
-    for cat in ["Education", "Health", "Electronics"]:
-        sub = st.selectbox(f"Select a subcategory for {cat}", categories[cat], key=f"{cat}_sub")
-        val = st.number_input(f"{cat} - {sub}", min_value=0.0, value=10000.0, step=100.0, key=f"{cat}_input")
-        category_inputs[f"{cat} ({sub})"] = val
+# Categories shown in each input column
+cat_layout = [
+    ["Food", "Transport"],
+    ["Housing", "Clothing"],
+    ["Education", "Health", "Electronics"],
+]
+
+# Batch the inputs in a form so edits only rerun the script on submit
+with st.form("predict_form"):
+    for col, cats in zip(st.columns(len(cat_layout)), cat_layout):
+        with col:
+            for cat in cats:
+                sub = st.selectbox(f"Select a subcategory for {cat}", categories[cat], key=f"{cat}_sub")
+                # Fixed label: inside the form `sub` only updates on submit, and a changing
+                # label would reset the amount the user typed
+                val = st.number_input(f"{cat} amount (₦)", min_value=0.0, value=10000.0, step=100.0, key=f"{cat}_input")
+                category_inputs[f"{cat} ({sub})"] = val
+
+    submitted = st.form_submit_button(" Predict Past Value")
 
 # Prediction
-if st.button(" Predict Past Value"):
-    total_today = sum(category_inputs.values())
-    total_past = (total_today * past_cpi_year) / latest_cpi
+if submitted:
+    labels = list(category_inputs)
+    amounts = np.fromiter(category_inputs.values(), dtype=np.float64)
+    ratio = past_cpi_year / summary["latest_cpi"]
+    past_arr = amounts * ratio
+    total_today = amounts.sum()
+    total_past = total_today * ratio
 
     st.success(f"That amount had the value of approximately ₦{total_past:,.2f} in {comparison_year}.")
 
@@ -133,9 +220,9 @@ if st.button(" Predict Past Value"):
     > Prices have more than doubled in the last decade — a reflection of Nigeria’s inflation challenges.
     """.format(
         past_cpi_year,
-        latest_cpi,
+        summary["latest_cpi"],
         comparison_year,
-        df["Date"].max().strftime('%Y'),
+        summary["max_year_str"],
         int(total_today),
         total_past,
         comparison_year
@@ -143,33 +230,25 @@ if st.button(" Predict Past Value"):
 
     # Show per-category past values
     st.subheader(" Breakdown by Category")
-    for category, amount in category_inputs.items():
-        old_value = amount * past_cpi_year / latest_cpi
-        st.markdown(f"- **{category}**: ₦{amount:,.2f} today ≈ ₦{old_value:,.2f} in {comparison_year}")
+    breakdown_df = pd.DataFrame(
+        {"Today (₦)": amounts, f"{comparison_year} equivalent (₦)": past_arr},
+        index=labels,
+    )
+    st.dataframe(breakdown_df.style.format("{:,.2f}"))
 
     # Bar chart comparison
     st.subheader("Spending Comparison: Today vs Past")
-    past_values = [amount * past_cpi_year / latest_cpi for amount in category_inputs.values()]
-    labels = list(category_inputs.keys())
-    fig2, ax2 = plt.subplots()
-    bar_width = 0.35
-    x = range(len(labels))
-    ax2.bar(x, list(category_inputs.values()), width=bar_width, label="Today", color="gray")
-    ax2.bar([i + bar_width for i in x], past_values, width=bar_width, label=f"{comparison_year}")
-    ax2.set_xticks([i + bar_width / 2 for i in x])
-    ax2.set_xticklabels(labels, rotation=45, ha="right")
-    ax2.set_ylabel("₦ Value")
-    ax2.set_title("Monthly Spending Comparison")
-    ax2.legend()
-    ax2.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
-    st.pyplot(fig2)
+    periods = ["Today", f"{comparison_year}"]
+    chart_df = pd.DataFrame({"Category": labels, periods[0]: amounts, periods[1]: past_arr})
+    chart_df = chart_df.melt("Category", var_name="Period", value_name="Value")
+    chart = alt.Chart(chart_df, title="Monthly Spending Comparison").mark_bar().encode(
+        x=alt.X("Category:N", sort=labels, title=None, axis=alt.Axis(labelAngle=-45)),
+        xOffset=alt.XOffset("Period:N", sort=periods),
+        y=alt.Y("Value:Q", title="₦ Value", axis=alt.Axis(format=",.0f")),
+        color=alt.Color("Period:N", title=None, scale=alt.Scale(domain=periods, range=["gray", "#1f77b4"])),
+    )
+    st.altair_chart(chart, use_container_width=True)
 
 # Recommendations
 st.subheader("Recommendations")
-st.markdown("""
-- Review your savings plan regularly to factor in inflation.
-- Invest in inflation-resistant assets like real estate, stocks, or commodities.
-- Diversify your income sources to cushion against inflation shocks.
-- Monitor economic policies and global trends that affect inflation in Nigeria.
-- Use budgeting apps to track the real value of your expenses over time.
-""")
+st.markdown(RECS_MD)